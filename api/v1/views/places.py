@@ -101,9 +101,8 @@ def search_places_by_id():
                                          for i in states
                                          if storage.get(State, i)]
                                for city in s.cities})
-        places = [place
-                  for city in cities
-                  for place in city.places]
+        places = storage.search(Place,
+                                city_id__in=[city.id for city in cities])
 
     if storage_t == 'db':
         places = [place.to_dict() for place in places
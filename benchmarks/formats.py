@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage snapshot save and load time and size per format
+
+Usage: python3 -m benchmarks.formats [objects]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+
+def main(count):
+    """times a full save and a reload of count objects for each format"""
+    os.chdir(tempfile.mkdtemp())
+    from models.engine.file_storage import FileStorage
+    from models.engine.formats import formats
+    from models.review import Review
+
+    storage = FileStorage()
+    reviews = [Review(place_id="p{}".format(i % 1000),
+                      user_id="u{}".format(i % 5000),
+                      text="review {}".format(i)) for i in range(count)]
+    print("{:>10} {:>10} {:>10} {:>10} {:>10}".format(
+        "format", "objects", "save ms", "load ms", "KB"))
+    for name in ["json"] + list(formats):
+        FileStorage._FileStorage__format = formats.get(name)
+        FileStorage._FileStorage__objects = {r.__class__.__name__ + "." +
+                                             r.id: r for r in reviews}
+        FileStorage._FileStorage__fragments = {}
+        save = timeit.timeit(storage.compact, number=1)
+        FileStorage._FileStorage__objects = {}
+        load = timeit.timeit(storage.reload, number=1)
+        path = "file.json" if name == "json" else "file" + formats[name].suffix
+        print("{:>10} {:>10} {:>10.1f} {:>10.1f} {:>10.0f}".format(
+            name, storage.count(), save * 1000, load * 1000,
+            os.path.getsize(path) / 1024))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.reload() startup time and memory per serializer,
+snapshot layout and lazy mode
+
+Usage: python3 -m benchmarks.reload [objects]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import zlib
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_store(path, count, streamed):
+    """writes a store of count reviews, one per line with a checksum file
+    if streamed, else on a single line without one"""
+    sep = ",\n" if streamed else ", "
+    with open(path, 'wb') as f:
+        f.write(b"{\n" if streamed else b"{")
+        for i in range(count):
+            id = str(uuid.uuid4())
+            record = {"id": id, "created_at": "2017-09-28T21:03:54.052298",
+                      "updated_at": "2017-09-28T21:03:54.052302",
+                      "place_id": "p{}".format(i % 1000),
+                      "user_id": "u{}".format(i % 5000),
+                      "text": "review {}".format(i), "__class__": "Review"}
+            line = json.dumps("Review." + id) + ": " + json.dumps(record)
+            f.write(((sep if i else "") + line).encode("utf-8"))
+        f.write(b"\n}" if streamed else b"}")
+    if streamed:
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path + ".crc", 'w') as f:
+            f.write("{:08x} {:d}\n".format(zlib.crc32(data), len(data)))
+
+
+def child(path):
+    """reloads the store at path and prints the seconds and peak RSS MB"""
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
+    FileStorage._FileStorage__file_path = path
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(elapsed, storage.count(), (peak - before) / 1024)
+
+
+def main(count):
+    """times a reload of count objects for each serializer and layout"""
+    from models.engine.serializers import serializers
+    os.chdir(tempfile.mkdtemp())
+    env = dict(os.environ, PYTHONPATH=root)
+    print("{:>8} {:>10} {:>6} {:>10} {:>10} {:>12}".format(
+        "serial.", "layout", "lazy", "objects", "seconds", "peak +MB"))
+    for layout in ("streamed", "whole"):
+        path = os.path.abspath(layout + ".json")
+        write_store(path, count, layout == "streamed")
+        for name in serializers:
+            for lazy in ("0", "1"):
+                env["HBNB_FILE_SERIALIZER"] = name
+                env["HBNB_FILE_LAZY"] = lazy
+                out = subprocess.run([sys.executable, "-m",
+                                      "benchmarks.reload", "--child", path],
+                                     env=env, check=True,
+                                     stdout=subprocess.PIPE).stdout.split()
+                print("{:>8} {:>10} {:>6} {:>10} {:>10.2f} {:>12.0f}".format(
+                    name, layout, lazy, int(out[1]), float(out[0]),
+                    float(out[2])))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
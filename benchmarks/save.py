@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.save() cost against the size of the store
+
+Usage: python3 -m benchmarks.save [size ...]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+
+def main(sizes):
+    """times a full save and a save after one update for each size"""
+    os.chdir(tempfile.mkdtemp())
+    from models.engine.file_storage import FileStorage
+    from models.review import Review
+
+    storage = FileStorage()
+    print("{:>10} {:>12} {:>12}".format("objects", "full ms", "1 dirty ms"))
+    for size in sizes:
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__fragments = {}
+        reviews = [Review(text="review {}".format(i)) for i in range(size)]
+        for review in reviews:
+            storage.new(review)
+        full = timeit.timeit(storage.save, number=1)
+
+        def touch_and_save():
+            """updates a single review and saves the store"""
+            reviews[0].text = "updated"
+            storage.save()
+
+        dirty = min(timeit.repeat(touch_and_save, number=1, repeat=5))
+        print("{:>10} {:>12.1f} {:>12.1f}".format(size, full * 1000,
+                                                  dirty * 1000))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
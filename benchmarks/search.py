@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.search() with and without the column store
+
+Usage: python3 -m benchmarks.search [objects]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+from unittest import mock
+
+
+def main(count):
+    """times a Place search over count places for each search mode"""
+    os.chdir(tempfile.mkdtemp())
+    from models.engine import column_store
+    from models.engine.file_storage import FileStorage, columns
+    from models.place import Place
+
+    storage = FileStorage()
+    random.seed(0)
+    places = [Place(city_id="c{}".format(i % 1000),
+                    price_by_night=random.randrange(500),
+                    max_guest=random.randrange(1, 10),
+                    latitude=random.uniform(-90, 90)) for i in range(count)]
+    cities = ["c{}".format(i) for i in range(0, 1000, 10)]
+
+    def search():
+        """searches the cheap places of 100 cities for 4 guests"""
+        return storage.search(Place, city_id__in=cities,
+                              price_by_night__lt=100, max_guest__gte=4)
+
+    print("{:>10} {:>10} {:>10} {:>10}".format(
+        "columns", "objects", "found", "ms"))
+    for mode in ("none", "arrays", "numpy"):
+        if mode == "numpy" and column_store.numpy is None:
+            continue
+        store = None if mode == "none" else column_store.ColumnStore(columns)
+        FileStorage._FileStorage__columns = store
+        FileStorage._FileStorage__objects = {"Place." + p.id: p
+                                             for p in places}
+        storage.count(Place)
+        with mock.patch.object(column_store, "numpy",
+                               None if mode == "arrays" else
+                               column_store.numpy):
+            found = len(search())
+            elapsed = min(timeit.repeat(search, number=1, repeat=5))
+        print("{:>10} {:>10} {:>10} {:>10.1f}".format(
+            mode, count, found, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
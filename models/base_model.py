@@ -46,6 +46,12 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and lets the storage engine track it"""
+            super().__setattr__(name, value)
+            models.storage.changed(self, name)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         dictionary = self.__dict__.copy()
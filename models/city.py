@@ -26,8 +26,7 @@ class City(BaseModel, Base):
             from models.place import Place
             from models import storage
 
-            return [place for place in storage.all(Place).values()
-                    if place.city_id == self.id]
+            return storage.related(Place, "city_id", self.id)
 
     def __init__(self, *args, **kwargs):
         """initializes city"""
@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""
+Contains the ColumnStore class and the search conditions shared by the
+storage engines
+"""
+
+from array import array
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# operators of the attr__op=value search conditions; attr=value is "eq"
+operators = {"eq": operator.eq, "in": lambda a, b: a in b,
+             "gt": operator.gt, "gte": operator.ge,
+             "lt": operator.lt, "lte": operator.le}
+# column type -> array typecode; "str" columns hold dictionary codes
+typecodes = {"str": "q", "int": "q", "float": "d"}
+# encoded value of None or of a deleted row, by column type
+nulls = {"str": -1, "int": -2 ** 63, "float": float("nan")}
+
+
+def parse_conditions(conditions):
+    """returns the (attr, op, value) list of the keyword conditions"""
+    parsed = []
+    for name, value in conditions.items():
+        attr, _, op = name.partition("__")
+        op = op or "eq"
+        if op not in operators:
+            raise ValueError("unknown search operator {}".format(op))
+        parsed.append((attr, op, value))
+    return parsed
+
+
+def matches(obj, conditions):
+    """returns True if the attributes of obj meet all the conditions"""
+    for attr, op, value in conditions:
+        try:
+            if not operators[op](getattr(obj, attr, None), value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+class ColumnTable:
+    """one array per column of the stored objects of a class"""
+
+    def __init__(self, types):
+        """Instantiate a ColumnTable with the column types {attr: type}"""
+        self.types = types
+        self.columns = {attr: array(typecodes[type])
+                        for attr, type in types.items()}
+        # dictionary - str column -> value -> code
+        self.codes = {attr: {} for attr, type in types.items()
+                      if type == "str"}
+        # dictionary - <key> -> row, list - row -> <key> or None if free
+        self.rows = {}
+        self.keys = []
+        self.free = []
+        # dictionary - <key> -> attributes whose value no column can hold
+        self.irregular = {}
+
+    def put(self, key, values):
+        """Store the {attr: value} values of the object stored under key"""
+        row = self.rows.get(key)
+        if row is None:
+            if self.free:
+                row = self.free.pop()
+                self.keys[row] = key
+            else:
+                row = len(self.keys)
+                self.keys.append(key)
+                for attr, column in self.columns.items():
+                    column.append(nulls[self.types[attr]])
+            self.rows[key] = row
+        for attr, value in values.items():
+            code = self.encode(attr, value)
+            if code is None:
+                self.irregular.setdefault(key, set()).add(attr)
+                code = nulls[self.types[attr]]
+            elif key in self.irregular:
+                self.irregular[key].discard(attr)
+                if not self.irregular[key]:
+                    del self.irregular[key]
+            self.columns[attr][row] = code
+
+    def remove(self, key):
+        """Free the row of the object stored under key"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        for attr, column in self.columns.items():
+            column[row] = nulls[self.types[attr]]
+        self.keys[row] = None
+        self.free.append(row)
+        self.irregular.pop(key, None)
+
+    def encode(self, attr, value):
+        """returns the column value of value, or None if it has none"""
+        type = self.types[attr]
+        if value is None:
+            return nulls[type]
+        if type == "str":
+            if value.__class__ is not str:
+                return None
+            return self.codes[attr].setdefault(value, len(self.codes[attr]))
+        if type == "int":
+            if value.__class__ is not int or not -2 ** 63 < value < 2 ** 63:
+                return None
+            return value
+        if value.__class__ not in (int, float):
+            return None
+        return float(value)
+
+    def covers(self, condition):
+        """returns True if scan() can evaluate condition"""
+        attr, op, value = condition
+        if attr not in self.types:
+            return False
+        values = value if op == "in" else (value,)
+        try:
+            values = list(values)
+        except TypeError:
+            return False
+        if self.types[attr] == "str":
+            return op in ("eq", "in") and \
+                all(v.__class__ is str for v in values)
+        return all(v.__class__ in (int, float) for v in values)
+
+    def scan(self, conditions):
+        """returns the keys of the rows meeting the covered conditions,
+        and the keys with irregular values that must be tested one by one
+        """
+        if numpy is not None:
+            rows = self.__scan_arrays(conditions)
+        else:
+            rows = self.__scan_rows(conditions)
+        keys = [self.keys[row] for row in rows]
+        attrs = {attr for attr, op, value in conditions}
+        recheck = [key for key, irregular in self.irregular.items()
+                   if irregular & attrs]
+        return keys, recheck
+
+    def __operand(self, attr, op, value):
+        """returns the column encoded value of the condition operand"""
+        if self.types[attr] != "str":
+            return set(value) if op == "in" else value
+        codes = self.codes[attr]
+        if op == "in":
+            return {codes[v] for v in value if v in codes}
+        return codes.get(value, nulls["str"] - 1)
+
+    def __scan_rows(self, conditions):
+        """returns the rows meeting conditions, one value at a time"""
+        rows = None
+        for attr, op, value in conditions:
+            column = self.columns[attr]
+            test = operators[op]
+            value = self.__operand(attr, op, value)
+            null = nulls[self.types[attr]]
+            if rows is None:
+                rows = [row for row, v in enumerate(column)
+                        if v != null and test(v, value)]
+            else:
+                rows = [row for row in rows
+                        if column[row] != null and test(column[row], value)]
+        return rows
+
+    def __scan_arrays(self, conditions):
+        """returns the rows meeting conditions, a column at a time"""
+        mask = None
+        for attr, op, value in conditions:
+            column = self.columns[attr]
+            if not column:
+                return []
+            dtype = numpy.float64 if column.typecode == "d" else numpy.int64
+            values = numpy.frombuffer(column, dtype=dtype)
+            value = self.__operand(attr, op, value)
+            if op == "in":
+                found = numpy.isin(values, list(value))
+            else:
+                found = operators[op](values, value)
+            if self.types[attr] != "float":
+                found &= values != nulls[self.types[attr]]
+            mask = found if mask is None else mask & found
+            # drop the view so that the column may grow again
+            del values
+        return numpy.flatnonzero(mask).tolist()
+
+
+class ColumnStore:
+    """keeps chosen scalar attributes of the stored objects in typed
+    arrays, so that searches scan contiguous columns"""
+
+    def __init__(self, columns):
+        """Instantiate a ColumnStore of the {class name: {attr: type}}
+        columns, where type is "str", "int" or "float"
+        """
+        self.columns = columns
+        self.tables = {}
+
+    def table(self, name):
+        """returns the ColumnTable of the class name, or None"""
+        table = self.tables.get(name)
+        if table is None and name in self.columns:
+            table = self.tables[name] = ColumnTable(self.columns[name])
+        return table
+
+    def clear(self):
+        """Forget all the stored columns"""
+        self.tables.clear()
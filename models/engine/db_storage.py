@@ -5,6 +5,7 @@ Contains the class DBStorage
 
 import models
 from models.amenity import Amenity
+from models.engine.column_store import operators, parse_conditions
 from sqlalchemy.ext.declarative import declarative_base
 from models.city import City
 from models.place import Place
@@ -90,3 +91,18 @@ class DBStorage:
             for cls in classes.values():
                 count += len(self.__session.query(cls).all())
         return count
+
+    def search(self, cls, **conditions):
+        """Get the list of cls instances meeting all the conditions
+
+        attr=value asks for an equal attribute and attr__op=value for one
+        that is in (value), gt, gte, lt or lte value.
+        """
+        query = self.__session.query(cls)
+        for attr, op, value in parse_conditions(conditions):
+            column = getattr(cls, attr)
+            if op == "in":
+                query = query.filter(column.in_(list(value)))
+            else:
+                query = query.filter(operators[op](column, value))
+        return query.all()
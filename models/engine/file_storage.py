@@ -3,7 +3,13 @@
 Contains the FileStorage class
 """
 
-import json
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import zlib
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -11,9 +17,25 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from models.engine.column_store import ColumnStore, matches, \
+    parse_conditions
+from models.engine.formats import get_format
+from models.engine.group_commit import GroupCommit
+from models.engine.shards import remove_snapshot, shard_dir, shard_files, \
+    shard_of
+from models.engine.serializers import get_serializer
+from os import getenv
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign keys indexed by FileStorage, by class name
+foreign_keys = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+                "Review": ("place_id", "user_id")}
+# attributes kept in the column store for searches, by class name
+columns = {"Place": {"city_id": "str", "user_id": "str",
+                     "number_rooms": "int", "number_bathrooms": "int",
+                     "max_guest": "int", "price_by_night": "int",
+                     "latitude": "float", "longitude": "float"}}
 
 
 class FileStorage:
@@ -21,65 +43,786 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # class - JSON encoder/decoder picked by HBNB_FILE_SERIALIZER
+    __serializer = get_serializer()
+    # class - binary snapshot format picked by HBNB_FILE_FORMAT, None for JSON
+    __format = get_format()
+    # integer - files per class in <__file_path root>.shards, 0 for one file
+    __shards = int(getenv("HBNB_FILE_SHARDS", 0))
+    # dictionary - shard -> keys of the objects it holds, when sharded
+    __shard_keys = {}
+    # boolean - the next compaction rewrites every shard
+    __reshard = False
+    # boolean - append changes to <__file_path>.log instead of rewriting
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal records after which save() compacts the journal
+    __journal_limit = int(getenv("HBNB_FILE_JOURNAL_LIMIT", 10000))
+    # integer - records currently in the journal
+    __journal_size = 0
+    # dictionary - <key> -> "create", "update" or "delete" since last save
+    __pending = {}
+    # dictionary - <key> -> (obj, JSON text of obj.to_dict()) when saved
+    __fragments = {}
+    # float - seconds during which saves are coalesced into one flush
+    __commit_window = float(getenv("HBNB_FILE_COMMIT_WINDOW", 0)) / 1000
+    # integer - pending saves that start a flush before the window ends
+    __commit_batch = int(getenv("HBNB_FILE_COMMIT_BATCH", 0))
+    # GroupCommit - coalesces saves when __commit_window is set
+    __committer = None
+    # Lock - guards the creation of __committer
+    __committer_lock = threading.Lock()
+    # RLock - serializes the changes to the objects and indexes below
+    __lock = threading.RLock()
+    # RLock - serializes the writers and readers of the files on disk
+    __flush_lock = threading.RLock()
+    # tuple - signature of the files when this process last read or wrote
+    __loaded = None
+    # integer - processes parsing the snapshots in reload(), 0 for none
+    __workers = int(getenv("HBNB_FILE_RELOAD_WORKERS", 0))
+    # dictionary - phase -> seconds spent in it by the last reload()
+    __reload_stats = {}
+    # boolean - keep reloaded objects as snapshot lines until they are used
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # dictionary - <key> -> snapshot line of the objects not built yet
+    __raw = {}
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name> -> {<class name>.id: obj} partition
+    __classes = {}
+    # dictionary - (<class name>, <foreign key>) -> value -> {<key>: obj}
+    __fk_index = {}
+    # dictionary - <key> -> list of (value -> bucket, value) holding it
+    __fk_entries = {}
+    # ColumnStore - columns searched by search(), if HBNB_FILE_COLUMNS=1
+    __columns = ColumnStore(columns) if getenv("HBNB_FILE_COLUMNS") == "1" \
+        else None
+    # dictionary - the __objects dictionary the indexes were built from
+    __indexed = None
+
+    # Readers do not take any lock: they only use single dict operations
+    # (get, len, copy), which never see a dictionary mid-update, so a
+    # save in progress never blocks them. In lazy mode the indexes hold
+    # None for the objects kept in __raw, which readers build on access.
 
     def all(self, cls=None):
         """returns the dictionary __objects"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            self.__sync()
+            name = cls if isinstance(cls, str) else cls.__name__
+            return self.__built(self.__classes.get(name, {}))
+        self.__sync()
+        for key in list(self.__raw):
+            self.__build(key)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock:
+                self.__sync()
+                if self.__pending.get(key) != "create":
+                    stored = key in self.__objects or key in self.__raw
+                    self.__pending[key] = "update" if stored else "create"
+                self.__raw.pop(key, None)
+                self.__objects[key] = obj
+                self.__index(key, obj)
+
+    def save(self, wait=True):
+        """serializes __objects to the JSON file (path: __file_path)
+
+        With a commit window, the saves requested within the window share
+        a single flush, and wait tells whether to block until it is done.
+        """
+        if not self.__commit_window:
+            self.__flush()
+            return
+        with self.__committer_lock:
+            if self.__committer is None:
+                FileStorage.__committer = GroupCommit(self.__flush,
+                                                      self.__commit_window,
+                                                      self.__commit_batch)
+        self.__committer.request(wait)
 
-    def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+    def compact(self, format=None):
+        """writes all of __objects to the snapshot and empties the journal
+
+        format names the snapshot format ("json" or one of formats) to
+        write when it is not HBNB_FILE_FORMAT, which keeps the journal.
+        When sharded, only the shards of the changed objects are written.
+        """
+        fmt = get_format(format) if format else self.__format
+        export = fmt is not self.__format
+        with self.__flush_lock:
+            with self.__lock:
+                self.__sync()
+                dirty = self.__pending
+                if export:
+                    dirty = dict(dirty)
+                else:
+                    FileStorage.__pending = {}
+                full = export or self.__reshard or self.__journal_size > 0
+                if not self.__shards:
+                    snapshots = {None: (list(self.__objects.items()),
+                                        list(self.__raw.values()))}
+                elif full:
+                    snapshots = {shard: self.__shard_items(shard)
+                                 for shard in self.__shard_keys}
+                else:
+                    snapshots = {shard: self.__shard_items(shard)
+                                 for shard in {shard_of(key, self.__shards)
+                                               for key in dirty}}
+            self.__write_snapshots(fmt, dirty, snapshots, full)
+            if export:
+                return
+            FileStorage.__reshard = False
+            if self.__journal_size:
+                open(self.__file_path + ".log", 'w').close()
+                FileStorage.__journal_size = 0
+            FileStorage.__loaded = self.__signature()
+
+    def reshard(self, count):
+        """moves all objects to count shards per class, or to the single
+        JSON file when count is 0, and removes the previous files"""
+        with self.__flush_lock:
+            with self.__lock:
+                self.__sync()
+                old = list(self.__snapshots(self.__format).values())
+                FileStorage.__shards = count
+                self.__shard_keys.clear()
+                if count:
+                    for key in list(self.__objects) + list(self.__raw):
+                        self.__shard_keys.setdefault(shard_of(key, count),
+                                                     set()).add(key)
+                FileStorage.__reshard = True
+            self.compact()
+            new = self.__snapshots(self.__format).values()
+            for path in old:
+                if path not in new:
+                    remove_snapshot(path)
+            if not count:
+                try:
+                    os.rmdir(shard_dir(self.__file_path))
+                except OSError:
+                    pass
+            FileStorage.__loaded = self.__signature()
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
-            pass
+        """deserializes the JSON file and its journal to __objects
+
+        Objects with unsaved changes keep their in-memory state. With
+        HBNB_FILE_RELOAD_WORKERS, the snapshots are parsed and their
+        objects built by that many processes.
+        """
+        with self.__flush_lock:
+            start = time.perf_counter()
+            stats = {}
+            FileStorage.__loaded = self.__signature()
+            records = self.__read_journal()
+            read = time.perf_counter() - start
+            with self.__lock:
+                self.__sync()
+                snapshots = self.__snapshots(self.__format)
+                phase = time.perf_counter()
+                if not self.__parallel(snapshots, stats):
+                    stats.clear()
+                    for shard, path in snapshots.items():
+                        self.__load(shard, path)
+                    stats["load"] = time.perf_counter() - phase
+                phase = time.perf_counter() - read
+                for record in records:
+                    key = record["key"]
+                    if key in self.__pending:
+                        continue
+                    if record["op"] == "delete":
+                        if key in self.__objects or key in self.__raw:
+                            self.__remove(key)
+                        continue
+                    try:
+                        self.__put(key, record["obj"])
+                    except Exception:
+                        pass
+                stats["journal"] = time.perf_counter() - phase
+            stats["total"] = time.perf_counter() - start
+            FileStorage.__reload_stats = stats
+
+    def reload_stats(self):
+        """returns the seconds spent in each phase of the last reload()"""
+        return dict(self.__reload_stats)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                self.__sync()
+                if key in self.__objects or key in self.__raw:
+                    self.__remove(key)
+                    self.__pending[key] = "delete"
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method if the JSON file changed since last used"""
+        if self.__signature() != self.__loaded:
+            self.reload()
 
     def get(self, cls, id):
         """Get an object instance of a class from the file storage"""
         key = cls.__name__ + "." + id
-        return self.__objects.get(key, None)
+        obj = self.__objects.get(key, None)
+        if obj is None and key in self.__raw:
+            self.__sync()
+            obj = self.__build(key)
+        return obj
 
     def count(self, cls=None):
         """Get the count of a class instances"""
-        count = 0
         if cls:
-            for obj in self.__objects.keys():
-                count += obj.startswith(cls.__name__)
+            self.__sync()
+            name = cls if isinstance(cls, str) else cls.__name__
+            return len(self.__classes.get(name, {}))
+        return len(self.__objects) + len(self.__raw)
+
+    def related(self, cls, attr, value):
+        """Get the list of cls instances whose foreign key attr is value"""
+        self.__sync()
+        name = cls if isinstance(cls, str) else cls.__name__
+        bucket = self.__fk_index.get((name, attr), {}).get(value, {})
+        return list(self.__built(bucket).values())
+
+    def search(self, cls, **conditions):
+        """Get the list of cls instances meeting all the conditions
+
+        attr=value asks for an equal attribute and attr__op=value for one
+        that is in (value), gt, gte, lt or lte value.
+        """
+        conditions = parse_conditions(conditions)
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__sync()
+        table = self.__columns.table(name) if self.__columns else None
+        covered = [c for c in conditions if table and table.covers(c)]
+        if not covered:
+            objs = self.__built(self.__classes.get(name, {})).values()
+            return [obj for obj in objs if matches(obj, conditions)]
+        rest = [c for c in conditions if c not in covered]
+        with self.__lock:
+            keys, recheck = table.scan(covered)
+        objs = [self.__objects.get(key) or self.__build(key) for key in keys]
+        for key in recheck:
+            obj = self.__objects.get(key) or self.__build(key)
+            if matches(obj, covered):
+                objs.append(obj)
+        return [obj for obj in objs if obj is not None and
+                matches(obj, rest)]
+
+    def changed(self, obj, attr):
+        """Track a stored obj after its attribute attr was assigned"""
+        name = obj.__class__.__name__
+        key = name + "." + obj.__dict__.get("id", "")
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock:
+            self.__pending.setdefault(key, "update")
+            if attr in foreign_keys.get(name, ()):
+                self.__sync()
+                self.__index(key, obj)
+            elif self.__columns and attr in columns.get(name, ()):
+                self.__sync()
+                self.__columns.table(name).put(key, {attr: getattr(obj, attr)})
+
+    def __load(self, shard, path):
+        """Store the objects of the snapshot path of shard"""
+        for key, record, entry in self.__read_snapshot(path, self.__format):
+            self.__check_shard(shard, key)
+            if key in self.__pending:
+                continue
+            try:
+                if self.__lazy:
+                    self.__put_raw(key, record, entry)
+                else:
+                    self.__put(key, record)
+            except Exception:
+                pass
+
+    def __parallel(self, snapshots, stats):
+        """Store the objects of the {shard: path} snapshots, parsed by a
+        pool of processes, and return False if there cannot be one"""
+        if self.__workers < 2 or self.__lazy or \
+                "fork" not in multiprocessing.get_all_start_methods():
+            return False
+        phase = time.perf_counter()
+        files = []
+        try:
+            jobs = []
+            for shard, path in snapshots.items():
+                ranges = self.__split(path)
+                if ranges is None:
+                    jobs.append((shard, path, None, None, None))
+                    continue
+                files.append(open(path, 'rb'))
+                jobs += [(shard, path, files[-1].fileno(), begin, end)
+                         for begin, end in ranges]
+            stats["plan"] = time.perf_counter() - phase
+            phase = time.perf_counter()
+            # forked workers inherit the open snapshots and the settings
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(self.__workers, context) as pool:
+                futures = [pool.submit(FileStorage.load_chunk, *job[1:])
+                           for job in jobs]
+                results = [future.result() for future in futures]
+        except Exception:
+            return False
+        finally:
+            for f in files:
+                f.close()
+        stats["parse"] = time.perf_counter() - phase
+        phase = time.perf_counter()
+        for (shard, *job), objs in zip(jobs, results):
+            for key, obj in objs:
+                self.__check_shard(shard, key)
+                if key not in self.__pending:
+                    self.__store(key, obj)
+        stats["index"] = time.perf_counter() - phase
+        return True
+
+    @classmethod
+    def load_chunk(cls, path, fd, begin, end):
+        """returns the (key, obj) built from the snapshot lines between the
+        offsets begin and end of the open file fd, or from the whole
+        snapshot path when fd is None"""
+        storage = cls()
+        if fd is None:
+            records = ((key, record) for key, record, entry in
+                       storage.__read_snapshot(path, cls.__format))
         else:
-            count = len(self.__objects)
-        return count
+            records = storage.__read_range(fd, begin, end)
+        objs = []
+        for key, record in records:
+            try:
+                objs.append((key, classes[record["__class__"]](**record)))
+            except Exception:
+                pass
+        return objs
+
+    def __split(self, path):
+        """returns the (begin, end) offsets of the line aligned chunks of
+        the snapshot path, or None if it must be read whole"""
+        if self.__format is not None or not self.__verify(path):
+            return None
+        size = os.path.getsize(path)
+        chunk = max(1 << 20, size // (self.__workers * 4))
+        with open(path, 'rb') as f:
+            if f.readline() != b"{\n":
+                return None
+            bounds = [0]
+            while bounds[-1] + chunk < size:
+                f.seek(bounds[-1] + chunk)
+                f.readline()
+                if f.tell() >= size:
+                    break
+                bounds.append(f.tell())
+        bounds.append(size)
+        return list(zip(bounds, bounds[1:]))
+
+    def __read_range(self, fd, begin, end):
+        """yields the (key, record) of the snapshot lines between the
+        offsets begin and end of the open file fd"""
+        loads = self.__serializer.loads
+        for line in os.pread(fd, end - begin, begin).split(b"\n"):
+            line = line.rstrip(b",")
+            if line and line not in (b"{", b"}"):
+                yield from loads(b"{" + line + b"}").items()
+
+    def __check_shard(self, shard, key):
+        """Ask for every shard to be rewritten if key is not in shard"""
+        expected = shard_of(key, self.__shards) if self.__shards else None
+        if shard != expected:
+            # written with another layout, so rewrite every shard
+            FileStorage.__reshard = True
+
+    def __put(self, key, record):
+        """Store the object built from the dictionary record under key"""
+        self.__store(key, classes[record["__class__"]](**record))
+
+    def __store(self, key, obj):
+        """Store obj under key"""
+        self.__raw.pop(key, None)
+        self.__objects[key] = obj
+        self.__index(key, obj)
+
+    def __put_raw(self, key, record, entry):
+        """Keep the snapshot line entry of record under key, unbuilt"""
+        if entry is None:
+            dumps = self.__serializer.dumps
+            entry = dumps(key) + b": " + dumps(record)
+        self.__objects.pop(key, None)
+        self.__raw[key] = entry
+        self.__index(key, None, record)
+
+    def __build(self, key):
+        """Build, store and return the object kept unbuilt under key"""
+        with self.__lock:
+            obj = self.__objects.get(key)
+            entry = self.__raw.get(key)
+            if obj is not None or entry is None:
+                return obj
+            record = self.__parse(key, entry)
+            obj = classes[record["__class__"]](**record)
+            del self.__raw[key]
+            self.__objects[key] = obj
+            prefix = self.__serializer.dumps(key) + b": "
+            if entry.startswith(prefix):
+                self.__fragments[key] = (obj, entry[len(prefix):])
+            self.__classes.setdefault(key.split(".", 1)[0], {})[key] = obj
+            for values, value in self.__fk_entries.get(key, ()):
+                values[value][key] = obj
+            return obj
+
+    def __built(self, objs):
+        """returns a copy of the dictionary objs with its None values built"""
+        objs = dict(objs)
+        for key, obj in objs.items():
+            if obj is None:
+                objs[key] = self.__build(key)
+        return {key: obj for key, obj in objs.items() if obj is not None}
+
+    def __parse(self, key, entry):
+        """returns the record of the snapshot line entry stored under key"""
+        return self.__serializer.loads(b"{" + entry + b"}")[key]
+
+    def __remove(self, key):
+        """Drop the object stored under key"""
+        self.__objects.pop(key, None)
+        self.__raw.pop(key, None)
+        self.__unindex(key)
+
+    def __encode_json(self, dirty, items, raw):
+        """returns the JSON snapshot of the (key, obj) items and snapshot
+        lines raw, encoding again only the objects whose key is in dirty,
+        and the {key: (obj, JSON text)} fragments of the objects"""
+        dumps = self.__serializer.dumps
+        fragments = {}
+        for key, obj in items:
+            fragment = self.__fragments.get(key)
+            if key in dirty or fragment is None or fragment[0] is not obj:
+                fragment = (obj, dumps(obj.to_dict()))
+            fragments[key] = fragment
+        # one object per line, so that reload() can stream the file
+        entries = [dumps(key) + b": " + fragment[1]
+                   for key, fragment in fragments.items()]
+        return b"{\n" + b",\n".join(entries + raw) + b"\n}", fragments
+
+    def __encode(self, fmt, dirty, items, raw):
+        """returns the fmt snapshot of the (key, obj) items and snapshot
+        lines raw"""
+        for key in dirty:
+            self.__fragments.pop(key, None)
+        records = [obj.to_dict() for key, obj in items]
+        loads = self.__serializer.loads
+        for entry in raw:
+            records.extend(loads(b"{" + entry + b"}").values())
+        return fmt.dumps(records)
+
+    def __write_snapshots(self, fmt, dirty, snapshots, full):
+        """writes the {shard: (items, raw)} snapshots in the format fmt,
+        removing the other shards if full"""
+        if None in snapshots:
+            items, raw = snapshots[None]
+            if fmt is None:
+                data, FileStorage.__fragments = self.__encode_json(dirty,
+                                                                   items, raw)
+            else:
+                data = self.__encode(fmt, dirty, items, raw)
+            self.__write_snapshot(data, self.__path(fmt))
+            return
+        directory = shard_dir(self.__file_path)
+        os.makedirs(directory, exist_ok=True)
+        for shard, (items, raw) in snapshots.items():
+            path = os.path.join(directory, shard + self.__suffix(fmt))
+            if not items and not raw:
+                remove_snapshot(path)
+            elif fmt is None:
+                data, fragments = self.__encode_json(dirty, items, raw)
+                self.__fragments.update(fragments)
+                self.__write_snapshot(data, path)
+            else:
+                self.__write_snapshot(self.__encode(fmt, dirty, items, raw),
+                                      path)
+        for key, op in dirty.items():
+            if op == "delete":
+                self.__fragments.pop(key, None)
+        if full:
+            for shard, path in shard_files(directory,
+                                           self.__suffix(fmt)).items():
+                if shard not in snapshots:
+                    remove_snapshot(path)
+
+    def __shard_items(self, shard):
+        """returns the (key, obj) items and raw lines of the objects of
+        shard"""
+        keys = self.__shard_keys.get(shard, ())
+        return ([(key, self.__objects[key]) for key in keys
+                 if key in self.__objects],
+                [self.__raw[key] for key in keys if key in self.__raw])
+
+    @staticmethod
+    def __suffix(fmt):
+        """returns the file name suffix of the snapshots in the format fmt"""
+        return ".json" if fmt is None else fmt.suffix
+
+    def __path(self, fmt):
+        """returns the path of the single snapshot in the format fmt"""
+        if fmt is None:
+            return self.__file_path
+        return os.path.splitext(self.__file_path)[0] + fmt.suffix
+
+    def __snapshots(self, fmt):
+        """returns the {shard: path} of the snapshots in the format fmt,
+        with the single snapshot under None when there are no shards"""
+        if self.__shards:
+            paths = shard_files(shard_dir(self.__file_path),
+                                self.__suffix(fmt))
+            if paths:
+                return paths
+        return {None: self.__path(fmt)}
+
+    def __write_snapshot(self, data, path):
+        """atomically replaces the snapshot path with data, keeping a backup
+
+        The checksum file is replaced before the snapshot, so a crash in
+        between leaves a mismatch that makes reload() use the backup.
+        """
+        with open(path + ".tmp", 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        for name in (path, path + ".crc"):
+            if os.path.exists(name):
+                self.__backup(name, name.replace(path, path + ".bak", 1))
+        with open(path + ".crc.tmp", 'w') as f:
+            f.write("{:08x} {:d}\n".format(zlib.crc32(data), len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".crc.tmp", path + ".crc")
+        os.replace(path + ".tmp", path)
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __backup(src, dst):
+        """atomically makes dst a copy of src, hard linking when possible"""
+        tmp = dst + ".tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
+    def __read_snapshot(self, path, fmt):
+        """yields the (key, record, line) of the last valid snapshot path
+        or its backup, in the format fmt
+
+        A snapshot matching its checksum is streamed one line at a time,
+        one without a checksum file is only used if it parses as a whole.
+        """
+        for path in (path, path + ".bak"):
+            verified = self.__verify(path)
+            if verified and fmt is None:
+                yield from self.__stream(path)
+                return
+            if verified or verified is None:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    if fmt is None:
+                        records = self.__serializer.loads(data).items()
+                    else:
+                        records = list(fmt.loads(data))
+                except (OSError, ValueError):
+                    continue
+                for key, record in records:
+                    yield key, record, None
+                return
+
+    @staticmethod
+    def __verify(path):
+        """returns True if path matches its checksum file, None if it has
+        no checksum file and False if it is missing or does not match"""
+        try:
+            with open(path + ".crc", 'r') as f:
+                crc, size = f.read().split()
+            crc, size = int(crc, 16), int(size)
+        except FileNotFoundError:
+            return None if os.path.exists(path) else False
+        except ValueError:
+            return False
+        actual = length = 0
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    actual = zlib.crc32(chunk, actual)
+                    length += len(chunk)
+        except FileNotFoundError:
+            return False
+        return actual == crc and length == size
+
+    def __stream(self, path):
+        """yields the (key, record, line) of the snapshot at path, where
+        line is the snapshot line of the record or None"""
+        loads = self.__serializer.loads
+        with open(path, 'rb') as f:
+            first = f.readline()
+            if first != b"{\n":
+                for key, record in loads(first + f.read()).items():
+                    yield key, record, None
+                return
+            for line in f:
+                line = line.rstrip(b",\n")
+                if line == b"}":
+                    return
+                if line:
+                    for key, record in loads(b"{" + line + b"}").items():
+                        yield key, record, line
+
+    def __flush(self):
+        """writes the pending changes to the journal or a new snapshot"""
+        with self.__flush_lock:
+            if self.__journal and self.__journal_size < self.__journal_limit:
+                self.__append()
+            else:
+                self.compact()
+
+    def __append(self):
+        """appends the pending changes to the journal"""
+        with self.__lock:
+            pending = self.__pending
+            FileStorage.__pending = {}
+            objs = {key: self.__objects.get(key) for key in pending}
+        lines = []
+        for key, op in pending.items():
+            self.__fragments.pop(key, None)
+            record = {"op": op, "key": key}
+            if op != "delete":
+                if objs[key] is None:
+                    continue
+                record["obj"] = objs[key].to_dict()
+            lines.append(self.__serializer.dumps(record) + b"\n")
+        try:
+            with open(self.__file_path + ".log", 'ab') as f:
+                f.write(b"".join(lines))
+        except Exception:
+            with self.__lock:
+                for key, op in pending.items():
+                    self.__pending.setdefault(key, op)
+            raise
+        FileStorage.__journal_size += len(lines)
+        FileStorage.__loaded = self.__signature()
+
+    def __signature(self):
+        """returns the inode, mtime and size of the snapshots and journal"""
+        signature = ()
+        paths = list(self.__snapshots(self.__format).values())
+        for path in paths + [self.__file_path + ".log"]:
+            try:
+                st = os.stat(path)
+                signature += ((path, st.st_ino, st.st_mtime_ns, st.st_size),)
+            except OSError:
+                signature += (None,)
+        return signature
+
+    def __read_journal(self):
+        """returns the journal records appended since the last snapshot"""
+        path = self.__file_path + ".log"
+        offset = 0
+        records = []
+        try:
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("truncated journal record")
+                    records.append(self.__serializer.loads(line))
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # drop the torn tail so later appends start on a clean line
+            os.truncate(path, offset)
+        FileStorage.__journal_size = len(records)
+        return records
+
+    def __index(self, key, obj, record=None):
+        """Add the object stored under key to the indexes, taking the
+        foreign keys from record when obj is not built yet"""
+        self.__unindex(key)
+        name = key.split(".", 1)[0]
+        self.__classes.setdefault(name, {})[key] = obj
+        entries = []
+        for attr in foreign_keys.get(name, ()):
+            if obj is None:
+                value = record.get(attr, getattr(classes[name], attr, None))
+            else:
+                value = getattr(obj, attr, None)
+            values = self.__fk_index.setdefault((name, attr), {})
+            values.setdefault(value, {})[key] = obj
+            entries.append((values, value))
+        self.__fk_entries[key] = entries
+        if self.__shards:
+            self.__shard_keys.setdefault(shard_of(key, self.__shards),
+                                         set()).add(key)
+        table = self.__columns.table(name) if self.__columns else None
+        if table is not None:
+            if obj is None:
+                table.put(key, {attr: record.get(attr, getattr(classes[name],
+                                                               attr, None))
+                                for attr in table.types})
+            else:
+                table.put(key, {attr: getattr(obj, attr, None)
+                                for attr in table.types})
+
+    def __unindex(self, key):
+        """Remove the object stored under key from the indexes"""
+        name = key.split(".", 1)[0]
+        self.__classes.get(name, {}).pop(key, None)
+        for values, value in self.__fk_entries.pop(key, ()):
+            bucket = values.get(value, {})
+            bucket.pop(key, None)
+            if not bucket:
+                values.pop(value, None)
+        if self.__shards:
+            shard = shard_of(key, self.__shards)
+            keys = self.__shard_keys.get(shard, set())
+            keys.discard(key)
+            if not keys:
+                self.__shard_keys.pop(shard, None)
+        table = self.__columns.tables.get(name) if self.__columns else None
+        if table is not None:
+            table.remove(key)
+
+    def __sync(self):
+        """Rebuild the indexes if __objects was replaced wholesale"""
+        if self.__indexed is self.__objects:
+            return
+        with self.__lock:
+            if self.__indexed is self.__objects:
+                return
+            # the unbuilt objects belong to the dictionary being replaced
+            for key, entry in self.__raw.items():
+                record = self.__parse(key, entry)
+                self.__indexed[key] = classes[record["__class__"]](**record)
+            self.__raw.clear()
+            self.__classes.clear()
+            self.__fk_index.clear()
+            self.__fk_entries.clear()
+            self.__shard_keys.clear()
+            if self.__columns:
+                self.__columns.clear()
+            for key, obj in self.__objects.items():
+                self.__index(key, obj)
+            FileStorage.__indexed = self.__objects
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the binary snapshot formats available to FileStorage
+
+Usage: python3 -m models.engine.formats <json|columnar>
+    writes the objects loaded by models.storage (configured through
+    HBNB_FILE_FORMAT) as a snapshot in the given format
+"""
+
+from datetime import datetime, timedelta
+from os import getenv
+import sys
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+epoch = datetime(1970, 1, 1)
+microsecond = timedelta(microseconds=1)
+
+
+class ColumnarFormat:
+    """msgpack snapshot with one set of columns per class and timestamps
+    stored as integer microseconds since the epoch"""
+    name = "columnar"
+    suffix = ".msgpack"
+    version = 1
+
+    @classmethod
+    def dumps(cls, records):
+        """returns the snapshot bytes of the to_dict() records"""
+        missing = msgpack.ExtType(0, b"")
+        tables = {}
+        for record in records:
+            table = tables.get(record["__class__"])
+            if table is None:
+                table = tables[record["__class__"]] = {
+                    "count": 0, "created_at": [], "updated_at": [],
+                    "columns": {}}
+            columns = table["columns"]
+            for attr, value in record.items():
+                if attr in ("__class__", "created_at", "updated_at"):
+                    continue
+                if attr not in columns:
+                    columns[attr] = [missing] * table["count"]
+                columns[attr].append(value)
+            table["count"] += 1
+            for column in columns.values():
+                if len(column) < table["count"]:
+                    column.append(missing)
+            for attr in ("created_at", "updated_at"):
+                stamp = datetime.fromisoformat(record[attr])
+                table[attr].append((stamp - epoch) // microsecond)
+        return msgpack.packb({"version": cls.version, "classes": tables})
+
+    @classmethod
+    def loads(cls, data):
+        """yields the (key, record) pairs of the snapshot bytes data"""
+        snapshot = msgpack.unpackb(data, strict_map_key=False)
+        if snapshot.get("version") != cls.version:
+            raise ValueError("unknown columnar snapshot version")
+        for name, table in snapshot["classes"].items():
+            columns = list(table["columns"].items())
+            times = zip(table["created_at"], table["updated_at"])
+            for i, (created_at, updated_at) in enumerate(times):
+                record = {}
+                for attr, column in columns:
+                    value = column[i]
+                    if type(value) is not msgpack.ExtType:
+                        record[attr] = value
+                record["created_at"] = (epoch + created_at * microsecond).\
+                    isoformat(timespec="microseconds")
+                record["updated_at"] = (epoch + updated_at * microsecond).\
+                    isoformat(timespec="microseconds")
+                record["__class__"] = name
+                yield name + "." + record["id"], record
+
+
+# installed binary snapshot formats by name
+formats = {}
+if msgpack is not None:
+    formats["columnar"] = ColumnarFormat
+
+
+def get_format(name=None):
+    """returns the snapshot format called name or HBNB_FILE_FORMAT, or
+    None for the default JSON snapshot"""
+    name = name or getenv("HBNB_FILE_FORMAT", "json")
+    if name == "json":
+        return None
+    if name not in formats:
+        raise ValueError("snapshot format {} is not installed".format(name))
+    return formats[name]
+
+
+if __name__ == "__main__":
+    from models import storage
+    storage.compact(sys.argv[1])
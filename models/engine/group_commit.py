@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the GroupCommit class
+"""
+
+import atexit
+import threading
+import time
+
+
+class GroupCommit:
+    """coalesces the save requests made within a window into one flush"""
+
+    def __init__(self, flush, window, batch=0):
+        """Instantiate a GroupCommit calling flush() at most once per window
+
+        window is in seconds; a flush also starts as soon as batch requests
+        are pending when batch is not 0.
+        """
+        self.flush = flush
+        self.window = window
+        self.batch = batch
+        self.requested = 0
+        self.done = 0
+        self.error = None
+        self.__cond = threading.Condition()
+        self.__flushing = threading.Lock()
+        self.__thread = None
+
+    def request(self, wait=True):
+        """Ask for a flush, blocking until it is on disk if wait is True"""
+        with self.__cond:
+            self.requested += 1
+            ticket = self.requested
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__thread.start()
+                atexit.register(self.drain)
+            self.__cond.notify_all()
+            if not wait:
+                return
+            while self.done < ticket:
+                self.__cond.wait()
+            if self.error and self.error[0] < ticket <= self.error[1]:
+                raise self.error[2]
+
+    def drain(self):
+        """Flush the outstanding requests now, in the calling thread"""
+        with self.__cond:
+            target = self.requested
+        if self.done < target:
+            self.__flush(target)
+
+    def __run(self):
+        """Flush the pending requests once the window or batch is reached"""
+        while True:
+            with self.__cond:
+                while self.requested == self.done:
+                    self.__cond.wait()
+                deadline = time.monotonic() + self.window
+                while not (self.batch and
+                           self.requested - self.done >= self.batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__cond.wait(remaining)
+                target = self.requested
+            self.__flush(target)
+
+    def __flush(self, target):
+        """Run flush() and wake the requests up to target"""
+        error = None
+        with self.__flushing:
+            start = self.done
+            if start >= target:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                error = (start, target, e)
+            with self.__cond:
+                if error is not None:
+                    self.error = error
+                self.done = target
+                self.__cond.notify_all()
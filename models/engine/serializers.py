@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the JSON serializers available to FileStorage
+"""
+
+import json
+from os import getenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONSerializer:
+    """encodes to and decodes from UTF-8 JSON with the standard library"""
+    name = "json"
+
+    @staticmethod
+    def dumps(obj):
+        """returns the JSON bytes of obj"""
+        return json.dumps(obj).encode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        """returns the object decoded from the JSON bytes or str data"""
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """encodes to and decodes from UTF-8 JSON with orjson"""
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj):
+        """returns the JSON bytes of obj"""
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        """returns the object decoded from the JSON bytes or str data"""
+        return orjson.loads(data)
+
+
+class UjsonSerializer:
+    """encodes to and decodes from UTF-8 JSON with ujson"""
+    name = "ujson"
+
+    @staticmethod
+    def dumps(obj):
+        """returns the JSON bytes of obj"""
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        """returns the object decoded from the JSON bytes or str data"""
+        return ujson.loads(data)
+
+
+# installed serializers by name, fastest first
+serializers = {}
+if orjson is not None:
+    serializers["orjson"] = OrjsonSerializer
+if ujson is not None:
+    serializers["ujson"] = UjsonSerializer
+serializers["json"] = JSONSerializer
+
+
+def get_serializer(name=None):
+    """returns the serializer called name, HBNB_FILE_SERIALIZER or the
+    fastest one installed"""
+    name = name or getenv("HBNB_FILE_SERIALIZER")
+    if name is None:
+        return next(iter(serializers.values()))
+    if name not in serializers:
+        raise ValueError("serializer {} is not installed".format(name))
+    return serializers[name]
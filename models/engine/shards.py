@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Contains the helpers of the sharded FileStorage layout, where the objects
+of each class are spread over HBNB_FILE_SHARDS files by a hash of their id
+
+Usage: python3 -m models.engine.shards <count>
+    moves the objects loaded by models.storage (in the layout given by
+    HBNB_FILE_SHARDS) to count shards per class, or back to the single
+    JSON file when count is 0
+"""
+
+import os
+import sys
+import zlib
+
+
+def shard_of(key, count):
+    """returns the name of the shard holding key among count per class"""
+    name, id = key.split(".", 1)
+    return "{}-{:d}".format(name, zlib.crc32(id.encode("utf-8")) % count)
+
+
+def shard_dir(path):
+    """returns the directory of the shards of the JSON file path"""
+    return os.path.splitext(path)[0] + ".shards"
+
+
+def shard_files(directory, suffix):
+    """returns the {shard: path} of the snapshots in directory"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return {}
+    return {name[:-len(suffix)]: os.path.join(directory, name)
+            for name in sorted(names) if name.endswith(suffix)}
+
+
+def remove_snapshot(path):
+    """removes the snapshot path with its checksum and backup files"""
+    for name in (path, path + ".crc", path + ".bak", path + ".bak.crc"):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    from models import storage
+    storage.reshard(int(sys.argv[1]))
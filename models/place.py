@@ -59,12 +59,7 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return models.storage.related(Review, "place_id", self.id)
 
         @property
         def amenities(self):
@@ -81,7 +76,7 @@ class Place(BaseModel, Base):
             else:
                 amenity = storage.get(Amenity, value.id)
                 if amenity and value.id not in self.amenity_ids:
-                    self.amenity_ids.append(value.id)
+                    self.amenity_ids = self.amenity_ids + [value.id]
 
         def to_dict(self):
             """returns a dictionary containing all
@@ -9,6 +9,7 @@ from datetime import datetime
 import inspect
 from models import storage
 import pep8
+import threading
 import unittest
 
 
@@ -157,3 +158,30 @@ class TestStateRoutes(unittest.TestCase):
         """Test /states/<state_id> DELETE failure"""
         state = self.app.delete(self.api + "nop")
         self.assertEqual(state.status_code, 404)
+
+    def test_concurrent_requests(self):
+        """Test the state routes hammered from many threads at once"""
+        errors = []
+
+        def hammer():
+            """Create, read, update and delete states"""
+            client = app.test_client()
+            for i in range(10):
+                post = client.post(self.api, json={"name": "Thread"})
+                state_id = post.json['id']
+                codes = [post.status_code,
+                         client.get(self.api + state_id).status_code,
+                         client.put(self.api + state_id,
+                                    json={"name": "Renamed"}).status_code,
+                         client.get(self.api).status_code,
+                         client.delete(self.api + state_id).status_code,
+                         client.get(self.api + state_id).status_code]
+                if codes != [201, 200, 200, 200, 200, 404]:
+                    errors.append(codes)
+
+        threads = [threading.Thread(target=hammer) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
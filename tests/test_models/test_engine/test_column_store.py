@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnStoreDocs and TestColumnTable classes
+"""
+
+import inspect
+from models.engine import column_store
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestColumnStoreDocs(unittest.TestCase):
+    """Tests to check the documentation and style of column_store"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = inspect.getmembers(column_store, inspect.isclass)
+
+    def test_pep8_conformance_column_store(self):
+        """Test that models/engine/column_store.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/column_store.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_column_store(self):
+        """Test tests/test_models/test_engine/test_column_store.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_column_store.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_column_store_module_docstring(self):
+        """Test for the column_store.py module docstring"""
+        self.assertIsNot(column_store.__doc__, None,
+                         "column_store.py needs a docstring")
+        self.assertTrue(len(column_store.__doc__) >= 1,
+                        "column_store.py needs a docstring")
+
+    def test_column_store_docstrings(self):
+        """Test for the docstrings of the classes and methods"""
+        for name, cls in self.classes:
+            with self.subTest(cls=name):
+                self.assertIsNot(cls.__doc__, None,
+                                 "{:s} needs a docstring".format(name))
+                for func in inspect.getmembers(cls, inspect.isfunction):
+                    self.assertIsNot(func[1].__doc__, None,
+                                     "{:s} method needs a docstring".
+                                     format(func[0]))
+
+
+class TestColumnTable(unittest.TestCase):
+    """Test the scans of a ColumnTable"""
+    def setUp(self):
+        """Fill a table with a few rows"""
+        self.table = column_store.ColumnTable(
+            {"city_id": "str", "price": "int", "latitude": "float"})
+        rows = [("a", 10, 1.5), ("b", 20, None), ("a", None, -2.0),
+                ("c", 30, 0.0), ("b", 40, 3)]
+        for i, (city_id, price, latitude) in enumerate(rows):
+            self.table.put(str(i), {"city_id": city_id, "price": price,
+                                    "latitude": latitude})
+        self.table.remove("3")
+        self.table.put("1", {"price": "free"})
+
+    def scan(self, **conditions):
+        """returns the sorted keys and rechecks meeting conditions"""
+        keys, recheck = self.table.scan(
+            column_store.parse_conditions(conditions))
+        return sorted(keys), sorted(recheck)
+
+    def check_scans(self):
+        """Test scans over each column type and operator"""
+        self.assertEqual(self.scan(city_id="a"), (["0", "2"], []))
+        self.assertEqual(self.scan(city_id__in=["b", "c", "z"]),
+                         (["1", "4"], []))
+        self.assertEqual(self.scan(city_id="z"), ([], []))
+        self.assertEqual(self.scan(price__lt=35), (["0"], ["1"]))
+        self.assertEqual(self.scan(price__gte=10, city_id="b"),
+                         (["4"], ["1"]))
+        self.assertEqual(self.scan(latitude__gt=0), (["0", "4"], []))
+        self.assertEqual(self.scan(latitude__in=[3, -2]), (["2", "4"], []))
+        self.table.put("1", {"price": 25})
+        self.assertEqual(self.scan(price__lte=25), (["0", "1"], []))
+
+    def test_scan_arrays(self):
+        """Test the vectorized scans"""
+        if column_store.numpy is None:
+            self.skipTest("numpy not installed")
+        self.check_scans()
+
+    def test_scan_rows(self):
+        """Test the scans without numpy"""
+        with mock.patch.object(column_store, "numpy", None):
+            self.check_scans()
+
+    def test_covers(self):
+        """Test that only the conditions a column can hold are covered"""
+        covers = self.table.covers
+        self.assertTrue(covers(("city_id", "in", ["a"])))
+        self.assertFalse(covers(("city_id", "lt", "a")))
+        self.assertFalse(covers(("city_id", "eq", None)))
+        self.assertFalse(covers(("name", "eq", "a")))
+        self.assertTrue(covers(("price", "gt", 2.5)))
+        self.assertFalse(covers(("price", "in", 3)))
+
+    def test_parse_conditions(self):
+        """Test the parsing of keyword conditions"""
+        self.assertEqual(column_store.parse_conditions(
+            {"name": "a", "price__gte": 3}),
+            [("name", "eq", "a"), ("price", "gte", 3)])
+        with self.assertRaises(ValueError):
+            column_store.parse_conditions({"price__ge": 3})
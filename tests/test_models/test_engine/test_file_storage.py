@@ -7,6 +7,8 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.formats import formats
+from models.engine.shards import shard_of
 from models import storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -19,6 +21,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -150,3 +153,369 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(state.id, get_state.id)
         self.assertEqual(get_state.name, "Swiss")
         self.storage.close()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that related returns the objects holding a foreign key"""
+        state = State(name="Indexed")
+        other = State(name="Other")
+        city = City(name="Indexed City", state_id=state.id)
+        for obj in [state, other, city]:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.related(City, "state_id", state.id),
+                         [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        self.storage.delete(city)
+        self.assertEqual(other.cities, [])
+        self.storage.delete(state)
+        self.storage.delete(other)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all filters objects by class or class name"""
+        state = State(name="Filtered")
+        self.storage.new(state)
+        key = "State." + state.id
+        self.assertIn(key, self.storage.all(State))
+        self.assertIn(key, self.storage.all("State"))
+        self.assertNotIn(key, self.storage.all(City))
+        self.storage.delete(state)
+        self.assertNotIn(key, self.storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_exact_class(self):
+        """Test that count does not match classes sharing a name prefix"""
+        class StateX(State):
+            """State subclass whose name starts with State"""
+
+        state_count = self.storage.count(State)
+        other = StateX(name="Prefixed")
+        self.storage.new(other)
+        self.assertEqual(self.storage.count(State), state_count)
+        self.assertEqual(self.storage.count(StateX), 1)
+        self.assertEqual(self.storage.count("StateX"), 1)
+        self.storage.delete(other)
+        self.assertEqual(self.storage.count(StateX), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journaled saves append records that reload replays"""
+        self.storage.compact()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal = True
+        try:
+            with open("file.json", "r") as f:
+                snapshot = f.read()
+            state = State(name="Journaled")
+            state.save()
+            state.name = "Renamed"
+            self.storage.save()
+            gone = State(name="Gone")
+            gone.save()
+            gone.delete()
+            self.storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(f.read(), snapshot)
+            with open("file.json.log", "r") as f:
+                ops = [json.loads(line)["op"] for line in f]
+            self.assertEqual(ops, ["create", "update", "create", "delete"])
+            save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, state.id).name,
+                             "Renamed")
+            self.assertIsNone(self.storage.get(State, gone.id))
+            FileStorage._FileStorage__objects = save
+            self.storage.compact()
+            self.assertEqual(os.path.getsize("file.json.log"), 0)
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+        finally:
+            FileStorage._FileStorage__journal = journal
+            self.storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_torn_record(self):
+        """Test that reload ignores and drops a torn journal record"""
+        self.storage.compact()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal = True
+        try:
+            state = State(name="Before tear")
+            state.save()
+            with open("file.json.log", "a") as f:
+                f.write('{"op":"delete","key":"State.')
+            self.storage.reload()
+            self.assertIsNotNone(self.storage.get(State, state.id))
+            with open("file.json.log", "r") as f:
+                self.assertTrue(f.read().endswith("}\n"))
+        finally:
+            FileStorage._FileStorage__journal = journal
+            self.storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_atomic(self):
+        """Test that save replaces file.json and records its checksum"""
+        state = State(name="Atomic")
+        state.save()
+        self.assertFalse(os.path.exists("file.json.tmp"))
+        with open("file.json", "rb") as f:
+            data = f.read()
+        with open("file.json.crc", "r") as f:
+            crc, size = f.read().split()
+        self.assertEqual(int(size), len(data))
+        self.assertIn("State." + state.id, json.loads(data))
+        self.storage.delete(state)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_falls_back_to_backup(self):
+        """Test that reload uses the backup when file.json is torn"""
+        state = State(name="Backed up")
+        state.save()
+        self.storage.save()
+        with open("file.json", "rb") as f:
+            data = f.read()
+        with open("file.json", "wb") as f:
+            f.write(data[:len(data) // 2])
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get(State, state.id))
+        FileStorage._FileStorage__objects = save
+        self.storage.delete(state)
+        self.storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reencodes_dirty_only(self):
+        """Test that save only calls to_dict on changed objects"""
+        state = State(name="Clean")
+        state.save()
+        with mock.patch.object(State, "to_dict", autospec=True,
+                               side_effect=State.to_dict) as to_dict:
+            self.storage.save()
+            self.assertEqual(to_dict.call_count, 0)
+            state.name = "Dirty"
+            self.storage.save()
+            self.assertEqual(to_dict.call_count, 1)
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Dirty")
+        self.storage.delete(state)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_group_commit(self):
+        """Test that saves within the commit window are flushed together"""
+        FileStorage._FileStorage__commit_window = 0.01
+        try:
+            state = State(name="Grouped")
+            state.save()
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+            self.storage.delete(state)
+            self.storage.save(wait=False)
+            FileStorage._FileStorage__committer.drain()
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + state.id, json.load(f))
+        finally:
+            FileStorage._FileStorage__commit_window = 0
+            FileStorage._FileStorage__committer = None
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_keeps_unsaved_changes(self):
+        """Test that reload does not undo changes that are not saved yet"""
+        state = State(name="Saved")
+        state.save()
+        state.name = "Unsaved"
+        self.storage.reload()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.storage.delete(state)
+        self.storage.reload()
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_reloads_only_on_change(self):
+        """Test that close only reloads when file.json changed on disk"""
+        self.storage.save()
+        with mock.patch.object(FileStorage, "reload") as reload:
+            self.storage.close()
+            self.assertFalse(reload.called)
+            with open("file.json", "r") as f:
+                data = f.read()
+            os.remove("file.json")
+            with open("file.json", "w") as f:
+                f.write(data)
+            self.storage.close()
+            self.assertTrue(reload.called)
+        self.storage.reload()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot_one_object_per_line(self):
+        """Test that snapshots hold one object per line and stream back"""
+        state = State(name="Streamed")
+        state.save()
+        with open("file.json", "r") as f:
+            lines = f.read().split("\n")
+        self.assertEqual(lines[0], "{")
+        self.assertEqual(lines[-1], "}")
+        self.assertEqual(len(lines), self.storage.count() + 2)
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Streamed")
+        self.assertEqual(len(self.storage.all()), len(save))
+        FileStorage._FileStorage__objects = save
+        self.storage.delete(state)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """Test that lazy reloads only build the objects that are used"""
+        state = State(name="Lazy")
+        city = City(name="Lazy City", state_id=state.id)
+        state.save()
+        city.save()
+        lazy = FileStorage._FileStorage__lazy
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        try:
+            self.storage.reload()
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            self.assertEqual(self.storage.count(), len(save))
+            self.assertEqual(self.storage.count(State),
+                             len([k for k in save if k[:6] == "State."]))
+            got = self.storage.get(State, state.id)
+            self.assertEqual(got.name, "Lazy")
+            self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+            self.assertEqual([c.id for c in got.cities], [city.id])
+            self.assertIn("City." + city.id, self.storage.all(City))
+            self.storage.delete(got)
+            self.storage.compact()
+            with open("file.json", "r") as f:
+                stored = json.load(f)
+            self.assertNotIn("State." + state.id, stored)
+            self.assertIn("City." + city.id, stored)
+            self.assertEqual(len(stored), len(save) - 1)
+        finally:
+            FileStorage._FileStorage__lazy = lazy
+            FileStorage._FileStorage__objects = save
+            self.storage.all()
+        self.storage.delete(state)
+        self.storage.delete(city)
+        self.storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf("columnar" not in formats, "msgpack not installed")
+    def test_columnar_snapshot(self):
+        """Test that the columnar format is converted to and reloaded"""
+        state = State(name="Columnar")
+        state.save()
+        self.storage.compact("columnar")
+        self.assertTrue(os.path.exists("file.msgpack.crc"))
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+        fmt = FileStorage._FileStorage__format
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__format = formats["columnar"]
+        FileStorage._FileStorage__objects = {}
+        try:
+            self.storage.reload()
+            got = self.storage.get(State, state.id)
+            self.assertEqual(got.to_dict(), state.to_dict())
+            self.assertEqual(self.storage.count(), len(save))
+            self.storage.delete(got)
+            self.storage.save()
+            FileStorage._FileStorage__objects = {}
+            self.storage.reload()
+            self.assertIsNone(self.storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__format = fmt
+            FileStorage._FileStorage__objects = save
+            self.storage.all()
+            for suffix in ("", ".crc", ".bak", ".bak.crc"):
+                if os.path.exists("file.msgpack" + suffix):
+                    os.remove("file.msgpack" + suffix)
+        self.storage.delete(state)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search(self):
+        """Test that search filters with and without the column store"""
+        place = Place(city_id="search city", price_by_night=50,
+                      latitude=1.5, name="Search")
+        other = Place(city_id="search city", price_by_night=90,
+                      name="Other")
+        place.save()
+        other.save()
+        store = FileStorage._FileStorage__columns
+        save = FileStorage._FileStorage__objects
+        try:
+            for columns in (None, file_storage.ColumnStore(
+                    file_storage.columns)):
+                FileStorage._FileStorage__columns = columns
+                FileStorage._FileStorage__objects = dict(save)
+                search = self.storage.search
+                with self.subTest(columns=columns):
+                    self.assertEqual(search(Place, city_id="search city",
+                                            price_by_night__lt=60),
+                                     [place])
+                    self.assertEqual(search(Place, city_id__in=[
+                        "search city"], name="Other"), [other])
+                    self.assertEqual(search(Place, latitude__gte=1,
+                                            city_id="search city"), [place])
+                    other.price_by_night = 10
+                    self.assertEqual(len(search(Place, city_id="search city",
+                                                price_by_night__lt=60)), 2)
+                    other.price_by_night = 90
+        finally:
+            FileStorage._FileStorage__columns = store
+            FileStorage._FileStorage__objects = save
+            self.storage.all()
+        self.storage.delete(place)
+        self.storage.delete(other)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reshard(self):
+        """Test that saves only rewrite the shards of changed objects"""
+        state = State(name="Sharded")
+        city = City(name="Sharded City", state_id=state.id)
+        state.save()
+        city.save()
+        self.storage.reshard(3)
+        try:
+            self.assertFalse(os.path.exists("file.json"))
+            shards = sorted(os.listdir("file.shards"))
+            self.assertIn(shard_of("State." + state.id, 3) + ".json", shards)
+            stats = {name: os.stat("file.shards/" + name).st_mtime_ns
+                     for name in shards if name.endswith(".json")}
+            state.name = "Resharded"
+            with mock.patch.object(City, "to_dict", autospec=True) as to_dict:
+                self.storage.save()
+                self.assertEqual(to_dict.call_count, 0)
+            changed = [name for name, mtime in stats.items()
+                       if os.stat("file.shards/" + name).st_mtime_ns != mtime]
+            self.assertEqual(changed,
+                             [shard_of("State." + state.id, 3) + ".json"])
+            save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, state.id).name,
+                             "Resharded")
+            self.assertEqual(self.storage.count(), len(save))
+            self.assertEqual([c.id for c in self.storage.get(
+                State, state.id).cities], [city.id])
+        finally:
+            self.storage.reshard(0)
+        self.assertFalse(os.path.exists("file.shards"))
+        with open("file.json", "r") as f:
+            self.assertIn("City." + city.id, json.load(f))
+        self.storage.delete(state)
+        self.storage.delete(city)
+        self.storage.save()
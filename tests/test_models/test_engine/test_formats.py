@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the TestFormatsDocs and TestColumnarFormat classes
+"""
+
+import inspect
+from models.engine import formats
+import pep8
+import unittest
+
+
+class TestFormatsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of formats"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = inspect.getmembers(formats, inspect.isclass)
+
+    def test_pep8_conformance_formats(self):
+        """Test that models/engine/formats.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/formats.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_formats(self):
+        """Test tests/test_models/test_engine/test_formats.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_formats.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_formats_module_docstring(self):
+        """Test for the formats.py module docstring"""
+        self.assertIsNot(formats.__doc__, None,
+                         "formats.py needs a docstring")
+        self.assertTrue(len(formats.__doc__) >= 1,
+                        "formats.py needs a docstring")
+
+    def test_format_docstrings(self):
+        """Test for the docstrings of the format classes and methods"""
+        for name, cls in self.classes:
+            with self.subTest(cls=name):
+                self.assertIsNot(cls.__doc__, None,
+                                 "{:s} needs a docstring".format(name))
+                for func in inspect.getmembers(cls, inspect.ismethod):
+                    self.assertIsNot(func[1].__doc__, None,
+                                     "{:s} method needs a docstring".
+                                     format(func[0]))
+
+
+@unittest.skipIf("columnar" not in formats.formats, "msgpack not installed")
+class TestColumnarFormat(unittest.TestCase):
+    """Test the columnar snapshot format"""
+    def test_round_trip(self):
+        """Test that records with different attributes survive a dump"""
+        records = [
+            {"id": "1", "name": "Nevada", "__class__": "State",
+             "created_at": "2017-09-28T21:03:54.052298",
+             "updated_at": "2017-09-28T21:03:54.052302"},
+            {"id": "2", "number_rooms": 0, "latitude": None,
+             "amenity_ids": ["a"], "__class__": "Place",
+             "created_at": "2017-09-28T21:03:54.000000",
+             "updated_at": "2020-01-01T00:00:00.000001"},
+            {"id": "3", "name": "Texas", "extra": "x", "__class__": "State",
+             "created_at": "1999-12-31T23:59:59.999999",
+             "updated_at": "2017-09-28T21:03:54.052302"}]
+        data = formats.ColumnarFormat.dumps(records)
+        self.assertIs(type(data), bytes)
+        loaded = dict(formats.ColumnarFormat.loads(data))
+        self.assertEqual(loaded, {r["__class__"] + "." + r["id"]: r
+                                  for r in records})
+
+    def test_get_format(self):
+        """Test that formats are picked by name"""
+        self.assertIsNone(formats.get_format("json"))
+        self.assertIs(formats.get_format("columnar"),
+                      formats.ColumnarFormat)
+        with self.assertRaises(ValueError):
+            formats.get_format("yaml")
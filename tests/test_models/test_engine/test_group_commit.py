@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestGroupCommitDocs and TestGroupCommit classes
+"""
+
+import inspect
+from models.engine import group_commit
+import pep8
+import threading
+import time
+import unittest
+GroupCommit = group_commit.GroupCommit
+
+
+class TestGroupCommitDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GroupCommit class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.gc_f = inspect.getmembers(GroupCommit, inspect.isfunction)
+
+    def test_pep8_conformance_group_commit(self):
+        """Test that models/engine/group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_group_commit(self):
+        """Test tests/test_models/test_engine/test_group_commit.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_group_commit_module_docstring(self):
+        """Test for the group_commit.py module docstring"""
+        self.assertIsNot(group_commit.__doc__, None,
+                         "group_commit.py needs a docstring")
+        self.assertTrue(len(group_commit.__doc__) >= 1,
+                        "group_commit.py needs a docstring")
+
+    def test_group_commit_class_docstring(self):
+        """Test for the GroupCommit class docstring"""
+        self.assertIsNot(GroupCommit.__doc__, None,
+                         "GroupCommit class needs a docstring")
+        self.assertTrue(len(GroupCommit.__doc__) >= 1,
+                        "GroupCommit class needs a docstring")
+
+    def test_gc_func_docstrings(self):
+        """Test for the presence of docstrings in GroupCommit methods"""
+        for func in self.gc_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test the GroupCommit class"""
+    def setUp(self):
+        """Count the flushes"""
+        self.flushes = 0
+
+    def flush(self):
+        """Record a flush"""
+        self.flushes += 1
+
+    def request_from_threads(self, committer, count):
+        """Request a flush from count threads at once"""
+        threads = [threading.Thread(target=committer.request)
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_coalesces_within_window(self):
+        """Test that concurrent requests share a flush"""
+        committer = GroupCommit(self.flush, 0.05)
+        self.request_from_threads(committer, 20)
+        self.assertEqual(committer.done, 20)
+        self.assertLess(self.flushes, 20)
+
+    def test_batch_starts_flush(self):
+        """Test that a full batch does not wait for the window"""
+        committer = GroupCommit(self.flush, 60, batch=4)
+        start = time.monotonic()
+        self.request_from_threads(committer, 4)
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertEqual(self.flushes, 1)
+
+    def test_no_wait(self):
+        """Test that a request without wait returns before the flush"""
+        committer = GroupCommit(self.flush, 60)
+        committer.request(wait=False)
+        self.assertEqual(self.flushes, 0)
+        committer.drain()
+        self.assertEqual(self.flushes, 1)
+        self.assertEqual(committer.done, 1)
+
+    def test_error_reaches_waiters(self):
+        """Test that a failed flush raises in the waiting requests"""
+        def fail():
+            """Fail to flush"""
+            raise OSError("disk full")
+
+        committer = GroupCommit(fail, 0.01)
+        with self.assertRaises(OSError):
+            committer.request()
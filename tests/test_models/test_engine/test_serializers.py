@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializersDocs and TestSerializers classes
+"""
+
+import inspect
+from models.engine import serializers
+import pep8
+import unittest
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializers"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = inspect.getmembers(serializers, inspect.isclass)
+
+    def test_pep8_conformance_serializers(self):
+        """Test that models/engine/serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializers(self):
+        """Test tests/test_models/test_engine/test_serializers.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializers_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertIsNot(serializers.__doc__, None,
+                         "serializers.py needs a docstring")
+        self.assertTrue(len(serializers.__doc__) >= 1,
+                        "serializers.py needs a docstring")
+
+    def test_serializer_docstrings(self):
+        """Test for the docstrings of the serializer classes and methods"""
+        for name, cls in self.classes:
+            with self.subTest(cls=name):
+                self.assertIsNot(cls.__doc__, None,
+                                 "{:s} needs a docstring".format(name))
+                for func in inspect.getmembers(cls, inspect.isfunction):
+                    self.assertIsNot(func[1].__doc__, None,
+                                     "{:s} method needs a docstring".
+                                     format(func[0]))
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the installed serializers"""
+    def test_round_trip(self):
+        """Test that every serializer decodes what it encodes"""
+        obj = {"name": "Café", "number_rooms": 3, "latitude": 37.77,
+               "amenity_ids": ["a", "b"], "__class__": "Place"}
+        for name, serializer in serializers.serializers.items():
+            with self.subTest(serializer=name):
+                data = serializer.dumps(obj)
+                self.assertIs(type(data), bytes)
+                self.assertEqual(serializer.loads(data), obj)
+                self.assertEqual(serializers.JSONSerializer.loads(data), obj)
+
+    def test_get_serializer(self):
+        """Test that serializers are picked by name"""
+        self.assertIs(serializers.get_serializer("json"),
+                      serializers.JSONSerializer)
+        self.assertIn(serializers.get_serializer(),
+                      serializers.serializers.values())
+        with self.assertRaises(ValueError):
+            serializers.get_serializer("yaml")
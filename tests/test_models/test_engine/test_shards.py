@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Contains the TestShardsDocs and TestShards classes
+"""
+
+import inspect
+from models.engine import shards
+import os
+import pep8
+import tempfile
+import unittest
+
+
+class TestShardsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of shards"""
+    def test_pep8_conformance_shards(self):
+        """Test that models/engine/shards.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/shards.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_shards(self):
+        """Test tests/test_models/test_engine/test_shards.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_shards.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_shards_module_docstring(self):
+        """Test for the shards.py module docstring"""
+        self.assertIsNot(shards.__doc__, None,
+                         "shards.py needs a docstring")
+        self.assertTrue(len(shards.__doc__) >= 1,
+                        "shards.py needs a docstring")
+
+    def test_shards_func_docstrings(self):
+        """Test for the presence of docstrings in shards functions"""
+        for name, func in inspect.getmembers(shards, inspect.isfunction):
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+
+
+class TestShards(unittest.TestCase):
+    """Test the shard helpers"""
+    def test_shard_of(self):
+        """Test that keys are spread by class and stable id hash"""
+        self.assertEqual(shards.shard_of("State.abc", 1), "State-0")
+        self.assertEqual(shards.shard_of("State.abc", 8),
+                         shards.shard_of("State.abc", 8))
+        names = {shards.shard_of("City.{}".format(i), 4) for i in range(64)}
+        self.assertEqual(names, {"City-0", "City-1", "City-2", "City-3"})
+
+    def test_shard_files(self):
+        """Test that only the snapshots of a directory are listed"""
+        directory = tempfile.mkdtemp()
+        for name in ("A-0.json", "A-0.json.crc", "A-0.json.bak",
+                     "A-1.json.tmp", "B-0.json"):
+            open(os.path.join(directory, name), 'w').close()
+        self.assertEqual(list(shards.shard_files(directory, ".json")),
+                         ["A-0", "B-0"])
+        shards.remove_snapshot(os.path.join(directory, "A-0.json"))
+        self.assertEqual(sorted(os.listdir(directory)),
+                         ["A-1.json.tmp", "B-0.json"])
+        self.assertEqual(shards.shard_files(directory + "/none", ".json"),
+                         {})
+        self.assertEqual(shards.shard_dir("dir/file.json"),
+                         "dir/file.shards")